@@ -68,7 +68,7 @@ class Wannier90Calculation(CalcJob):
 
     @classmethod
     def define(cls, spec):
-        super(Wannier90Calculation, cls).define(spec)
+        super().define(spec)
         spec.input(
             "structure",
             valid_type=StructureData,
@@ -171,6 +171,13 @@ class Wannier90Calculation(CalcJob):
             'The retrieved folder did not contain the required stdout output file.',
             invalidates_cache=True
         )
+        spec.exit_code(
+            211,
+            'ERROR_OUTPUT_STDOUT_UNRECOGNIZED',
+            message=
+            'The stdout output file could not be parsed as a Wannier90 output.',
+            invalidates_cache=True
+        )
         spec.exit_code(
             300,
             'ERROR_WERR_FILE_PRESENT',
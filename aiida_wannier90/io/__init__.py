@@ -8,12 +8,14 @@
 # For further information on the license, see the LICENSE.txt file             #
 ################################################################################
 """
-Writing input files
-===================
+Reading and writing files
+=========================
 
-This submodule contains helper functions to create input files.
+This submodule contains helper functions to create input files and to
+parse output files.
 """
 
 from ._write_win import write_win
+from ._parse_wout import raw_wout_parser, UnrecognizedWoutError
 
-__all__ = ('write_win', )
+__all__ = ('write_win', 'raw_wout_parser', 'UnrecognizedWoutError')
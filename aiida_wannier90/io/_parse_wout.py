@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c), AiiDA team and individual contributors.                       #
+#  All rights reserved.                                                        #
+# This file is part of the AiiDA-wannier90 code.                               #
+#                                                                              #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-wannier90 #
+# For further information on the license, see the LICENSE.txt file             #
+################################################################################
+
+import itertools
+
+__all__ = ('raw_wout_parser', 'UnrecognizedWoutError')
+
+# Parameters parsed from the blocks of the .wout file. Each entry maps the
+# label printed by Wannier90 to a tuple
+# (output key, type, expected value, warning if the value is not the expected one);
+# the last two are None if the value does not need to be checked.
+_MAIN_KEYS = {
+    'Number of Wannier Functions': ('number_wfs', int, None, None),
+    'Output verbosity (1=low, 5=high)': (
+        'output_verbosity', int, 1,
+        'Parsing is only supported if output verbosity is set to 1'
+    ),
+    'Length Unit':
+    ('length_units', str, 'Ang', 'Units not Ang, be sure this is OK!'),
+    'Post-processing setup (write *.nnkp)':
+    ('preprocess_only', str, None, None),
+}
+_WANNIERISE_KEYS = {
+    'Convergence tolerence': ('convergence_tolerance', float, None, None),
+    'Write r^2_nm to file': (
+        'r2mn_writeout', str, 'F', 'The r^2_nm file has been selected '
+        'to be written, but this is not yet supported!'
+    ),
+    'Write xyz WF centres to file': (
+        'xyz_writeout', str, 'F', 'The xyz_WF_center file has '
+        'been selected to be written, but this is not yet supported!'
+    ),
+}
+# The Wannier90 banner must appear within this many lines at the top of
+# the .wout file
+_BANNER_LINES = 50
+# Prefixes of the section headers and of the final state, once the line is
+# stripped of the leading whitespace
+_LINE_ANCHORS = ('*-', 'Final State')
+
+
+class UnrecognizedWoutError(ValueError):
+    """
+    Raised by raw_wout_parser when the file does not look like the output
+    of Wannier90.
+    """
+
+
+def raw_wout_parser(wann_out_file):  # pylint: disable=too-many-locals,too-many-statements # noqa:  disable=MC0001
+    '''
+    This section will parse a .wout file and return certain key
+    parameters such as the centers and spreads of the
+    wannier90 functions, the Im/Re ratios, certain warnings,
+    and labels indicating output files produced
+
+    The file is scanned only once, so it can be passed as an open file
+    handle without loading it in memory.
+
+    The returned dictionary only contains JSON-native values (str, int,
+    float, None, and lists and dicts of them, no tuples or numpy types),
+    so that it is stored as is in a Dict node.
+
+    :param wann_out_file: the .wout file, as an iterable of strings
+        (e.g. a list of lines or an open file handle)
+    :return out: a dictionary of parameters that can be stored as parameter data
+    :return exiting_in_stdout: True if the 'Exiting......' message of
+        Wannier90 has been found in the file
+    :raises UnrecognizedWoutError: if the WANNIER90 banner is not found at the top of
+        the file, i.e. this is not (or not the beginning of) a .wout file
+    '''
+    w90_conv = False  #Used to assess convergence of MLWF procedure use conv_tol and conv_window>1
+    exiting_in_stdout = False
+    warnings = []
+    out = {'warnings': warnings}
+    # Bound once, as it is called from the loop over all lines
+    append_warning = warnings.append
+    lines = iter(wann_out_file)
+    # Check the banner first, to bail out before scanning a whole file
+    # that is not a Wannier90 output
+    banner_lines = list(itertools.islice(lines, _BANNER_LINES))
+    if not any('WANNIER90' in line for line in banner_lines):
+        raise UnrecognizedWoutError(
+            'The WANNIER90 banner was not found in the first {} lines, '
+            'this is not a Wannier90 output file'.format(_BANNER_LINES)
+        )
+    lines = itertools.chain(banner_lines, lines)
+    for line in lines:
+        # checks for any warnings
+        if 'Warning' in line:
+            # Certain warnings get a special flag
+            append_warning(line)
+
+        # Wannier90 doesn't always write the .werr file on error
+        if 'Exiting......' in line:
+            exiting_in_stdout = True
+
+        if 'Wannierisation convergence criteria satisfied' in line:
+            w90_conv = True
+
+        if ' Maximum Im/Re Ratio' in line:
+            parts = line.split()
+            wann_functions = out['wannier_functions_output']
+            wann_id = int(parts[3])
+            wann_function = wann_functions[wann_id - 1]
+            wann_function['im_re_ratio'] = float(parts[-1])
+
+        # All the other markers below are at the beginning of the line
+        # (e.g. ' *------ MAIN ------*' or ' Final State'): most lines are
+        # skipped with a single prefix test
+        stripped = line.lstrip()
+        if not stripped.startswith(_LINE_ANCHORS):
+            continue
+
+        # From the 'initial' part of the output, only sections which indicate
+        # whether certain files have been written, e.g. 'Write r^2_nm to file'
+        # the units used, e.g. 'Length Unit', that will guide the parser
+        # e.g. 'Number of Wannier Functions', or which supplament warnings
+        # not directly provided, e.g. unconvergerged wannierization needs
+        # some logic in AiiDa to determine whether it met the convergence
+        # target or not...
+
+        # Parses some of the MAIN parameters
+        if 'MAIN' in stripped:
+            _parse_block(lines, out, _MAIN_KEYS, append_warning)
+
+        # Parses some of the WANNIERISE parameters
+        if 'WANNIERISE' in stripped:
+            _parse_block(lines, out, _WANNIERISE_KEYS, append_warning)
+
+        # Reading the final WF, also checks to see if they converged or not
+        if stripped.startswith('Final State'):
+            # Originally wanted to implement automatic convergence check
+            # but parsing this using the version below fails depending
+            # on the convergence settings used in the aiida.win file
+            # Final_check_line = wann_out_file[i-2]
+            # if  'Wannierisation convergence criteria satisfied' \
+            #         not in Final_check_line:
+            #     Final_Delta = float(Final_check_line.split()[-3])
+            #     if abs(Final_Delta) > out['convergence_tolerance']:
+            #         out['Warnings'] += ['Wannierization not converged within '
+            #         'specified tolerance!']
+            num_wf = out['number_wfs']
+            wf_out = []
+            for line in itertools.islice(lines, num_wf):
+                # e.g. 'WF centre and spread  1  ( -0.866225,  1.973775,  1.973775 )  1.11664626'
+                # Split the line only once, then convert each field
+                head, _, tail = line.partition('(')
+                centre, _, spread = tail.partition(')')
+                wf_out_i = {'wf_ids': int(head.rsplit(None, 1)[-1])}
+                centre = centre.split(',')
+                coord = []
+                for idx in range(3):
+                    try:
+                        coord.append(float(centre[idx]))
+                    except (ValueError, IndexError):
+                        # To avoid that the crasher completely fails, we set None as a fallback
+                        coord.append(None)
+                wf_out_i['wf_centres'] = coord
+                wf_out_i['wf_spreads'] = _parse_float(spread)
+                wf_out.append(wf_out_i)
+            out['wannier_functions_output'] = wf_out
+            # Skip the 'Sum of centres and spreads' line
+            next(lines, None)
+            for line in itertools.islice(lines, 4):
+                if 'Omega I' in line:
+                    out['Omega_I'] = _parse_float(line.rsplit(None, 1)[-1])
+                if 'Omega D' in line:
+                    out['Omega_D'] = _parse_float(line.rsplit(None, 1)[-1])
+                if 'Omega OD' in line:
+                    out['Omega_OD'] = _parse_float(line.rsplit(None, 1)[-1])
+                if 'Omega Total' in line:
+                    out['Omega_total'] = _parse_float(line.rsplit(None, 1)[-1])
+    if not w90_conv:
+        append_warning('Wannierisation finished because num_iter was reached.')
+    return out, exiting_in_stdout
+
+
+def _parse_block(lines, out, keys, append_warning):
+    """
+    Parse a block of parameters of the .wout file (e.g. MAIN or WANNIERISE),
+    up to and including the closing '-----' line.
+
+    :param lines: iterator over the lines of the .wout file, positioned
+        right after the block header
+    :param out: the dictionary of parsed parameters, updated in place
+    :param keys: dictionary of the parameters to parse, in the format of
+        ``_MAIN_KEYS``
+    :param append_warning: callable to add a warning to the output
+    """
+    for line in lines:
+        if '-----' in line:
+            break
+        # e.g. ' |  Length Unit       :       Ang      |'
+        label = line.split(':', 1)[0].strip(' |')
+        key_spec = keys.get(label)
+        if key_spec is None:
+            continue
+        out_key, value_type, expected, warning = key_spec
+        # The value is the second-to-last field, before the closing '|':
+        # only split off the last two fields
+        value = value_type(line.rsplit(None, 2)[-2])
+        out[out_key] = value
+        if warning is not None and value != expected:
+            append_warning(warning)
+
+
+def _parse_float(value):
+    """
+    Convert a field of the .wout file to float, returning None if Wannier90
+    could not print it (e.g. '************' for an overflow).
+    """
+    try:
+        return float(value)
+    except ValueError:
+        return None
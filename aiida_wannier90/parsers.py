@@ -11,6 +11,8 @@ import os
 from aiida.parsers import Parser
 from aiida.common import exceptions as exc
 
+from .io import raw_wout_parser, UnrecognizedWoutError
+
 __all__ = (
     'Wannier90Parser',
     'band_parser',
@@ -35,7 +37,7 @@ class Wannier90Parser(Parser):
                     type(node.process_class)
                 )
             )
-        super(Wannier90Parser, self).__init__(node)
+        super().__init__(node)
 
     @staticmethod
     def _get_seedname_from_input_filename(input_filename):
@@ -78,25 +80,22 @@ class Wannier90Parser(Parser):
         except exc.NotExistent:
             return self.exit_codes.ERROR_NO_RETRIEVED_FOLDER
 
+        retrieved_names = set(out_folder.list_object_names())
+
         # Checks for error output files
-        if error_file_name in out_folder.list_object_names():
+        if error_file_name in retrieved_names:
             self.logger.error(
                 'Errors were found please check the retrieved '
                 '{} file'.format(error_file_name)
             )
             return self.exit_codes.ERROR_WERR_FILE_PRESENT
 
-        exiting_in_stdout = False
-        try:
-            with out_folder.open(output_file_name) as handle:
-                out_file = handle.readlines()
-            # Wannier90 doesn't always write the .werr file on error
-            if any('Exiting......' in line for line in out_file):
-                exiting_in_stdout = True
-        except OSError:
+        if output_file_name not in retrieved_names:
             self.logger.error("Standard output file could not be found.")
             return self.exit_codes.ERROR_OUTPUT_STDOUT_MISSING
 
+        # Attached before parsing the stdout, so that it is kept also if
+        # the stdout is not recognized
         if temporary_folder is not None:
             nnkp_temp_path = os.path.join(temporary_folder, nnkp_file_name)
             if os.path.isfile(nnkp_temp_path):
@@ -104,208 +103,93 @@ class Wannier90Parser(Parser):
                     node = SinglefileData(file=handle)
                     self.out('nnkp_file', node)
 
-        # Tries to parse the bands
-        try:
-            with out_folder.open('{}_band.dat'.format(seedname)) as fil:
-                band_dat = fil.readlines()
-            with out_folder.open('{}_band.kpt'.format(seedname)) as fil:
-                band_kpt = fil.readlines()
-        except IOError:
-            # IOError: _band.* files not present
-            pass
-        else:
-            structure = self.node.inputs.structure
-            ## TODO: should we catch exceptions here?
+        with out_folder.open(output_file_name) as handle:
+            # Parse the stdout while streaming it, so that the file is
+            # only read once and never fully loaded in memory
             try:
-                with out_folder.open(
-                    '{}_band.labelinfo.dat'.format(seedname)
-                ) as fil:
-                    band_labelinfo = fil.readlines()
-            except IOError:  # use legacy parser for wannier90 < 3.0
-                try:
-                    kpoint_path = self.node.inputs.kpoint_path
-                    special_points = kpoint_path.get_dict()
-                except (exc.NotExistent, KeyError):
-                    # exc.NotExistent: no input kpoint_path
-                    # KeyError: no get_dict()
-                    pass
-                else:
-                    output_bandsdata, band_warnings = band_parser_legacy(
-                        band_dat, band_kpt, special_points, structure
-                    )
-                    self.out('interpolated_bands', output_bandsdata)
-            else:
-                output_bandsdata, band_warnings = band_parser(
-                    band_dat, band_kpt, band_labelinfo, structure
+                wout_dictionary, exiting_in_stdout = raw_wout_parser(handle)
+            except UnrecognizedWoutError as exception:
+                self.logger.error(
+                    "Standard output file could not be parsed: {}".
+                    format(exception)
                 )
-                self.out('interpolated_bands', output_bandsdata)
+                return self.exit_codes.ERROR_OUTPUT_STDOUT_UNRECOGNIZED
 
-        # Parse the stdout an return the parsed data
-        wout_dictionary = raw_wout_parser(out_file)
-        try:
-            wout_dictionary['warnings'].extend(band_warnings)
-        except (KeyError, NameError):
-            # KeyError: wout_dictionary does not contain warnings
-            # NameError: no band_warnings
-            pass
+        # Tries to parse the bands
+        band_warnings = self._parse_bands(
+            out_folder, seedname, retrieved_names
+        )
+
+        wout_dictionary['warnings'].extend(band_warnings)
         output_data = Dict(dict=wout_dictionary)
         self.out('output_parameters', output_data)
 
         if exiting_in_stdout:
             return self.exit_codes.ERROR_EXITING_MESSAGE_IN_STDOUT
 
+    def _parse_bands(self, out_folder, seedname, retrieved_names):
+        """
+        Parse the interpolated bands, if the band files have been retrieved,
+        and attach them to the outputs.
 
-def raw_wout_parser(wann_out_file):  # pylint: disable=too-many-locals,too-many-statements # noqa:  disable=MC0001
-    '''
-    This section will parse a .wout file and return certain key
-    parameters such as the centers and spreads of the
-    wannier90 functions, the Im/Re ratios, certain warnings,
-    and labels indicating output files produced
-
-    :param out_file: the .wout file, as a list of strings
-    :return out: a dictionary of parameters that can be stored as parameter data
-    '''
-    w90_conv = False  #Used to assess convergence of MLWF procedure use conv_tol and conv_window>1
-    out = {}
-    out.update({'warnings': []})
-    for i, line in enumerate(wann_out_file):
-        # checks for any warnings
-        if 'Warning' in line:
-            # Certain warnings get a special flag
-            out['warnings'].append(line)
-
-        # From the 'initial' part of the output, only sections which indicate
-        # whether certain files have been written, e.g. 'Write r^2_nm to file'
-        # the units used, e.g. 'Length Unit', that will guide the parser
-        # e.g. 'Number of Wannier Functions', or which supplament warnings
-        # not directly provided, e.g. unconvergerged wannierization needs
-        # some logic in AiiDa to determine whether it met the convergence
-        # target or not...
-
-        # Parses some of the MAIN parameters
-        if 'MAIN' in line:
-            i += 1
-            line = wann_out_file[i]
-            while '-----' not in line:
-                line = wann_out_file[i]
-                if 'Number of Wannier Functions' in line:
-                    out.update({'number_wfs': int(line.split()[-2])})
-                if 'Length Unit' in line:
-                    out.update({'length_units': line.split()[-2]})
-                    if out['length_units'] != 'Ang':
-                        out['warnings'].append(
-                            'Units not Ang, '
-                            'be sure this is OK!'
-                        )
-
-                if 'Output verbosity (1=low, 5=high)' in line:
-                    out.update({'output_verbosity': int(line.split()[-2])})
-                    if out['output_verbosity'] != 1:
-                        out['warnings'].append(
-                            'Parsing is only supported '
-                            'if output verbosity is set to 1'
-                        )
-                if 'Post-processing' in line:
-                    out.update({'preprocess_only': line.split()[-2]})
-                i += 1
-
-        # Parses some of the WANNIERISE parameters
-        if 'WANNIERISE' in line:
-            i += 1
-            line = wann_out_file[i]
-            while '-----' not in line:
-                line = wann_out_file[i]
-                if 'Convergence tolerence' in line:
-                    out.update({
-                        'convergence_tolerance': float(line.split()[-2])
-                    })
-                if 'Write r^2_nm to file' in line:
-                    out.update({'r2mn_writeout': line.split()[-2]})
-                    if out['r2mn_writeout'] != 'F':
-                        out['warnings'].append(
-                            'The r^2_nm file has been selected '
-                            'to be written, but this is not yet supported!'
-                        )
-
-                if 'Write xyz WF centres to file' in line:
-                    out.update({'xyz_writeout': line.split()[-2]})
-                    if out['xyz_writeout'] != 'F':
-                        out['warnings'].append(
-                            'The xyz_WF_center file has '
-                            'been selected to be written, but this is not '
-                            'yet supported!'
-                        )
-
-                i += 1
-        if 'Wannierisation convergence criteria satisfied' in line:
-            w90_conv = True
-
-        # Reading the final WF, also checks to see if they converged or not
-        if 'Final State' in line:
-            # Originally wanted to implement automatic convergence check
-            # but parsing this using the version below fails depending
-            # on the convergence settings used in the aiida.win file
-            # Final_check_line = wann_out_file[i-2]
-            # if  'Wannierisation convergence criteria satisfied' \
-            #         not in Final_check_line:
-            #     Final_Delta = float(Final_check_line.split()[-3])
-            #     if abs(Final_Delta) > out['convergence_tolerance']:
-            #         out['Warnings'] += ['Wannierization not converged within '
-            #         'specified tolerance!']
-            num_wf = out['number_wfs']
-            wf_out = []
-            end_wf_loop = i + num_wf + 1
-            for i in range(i + 1, end_wf_loop):  # pylint: disable=redefined-outer-name
-                line = wann_out_file[i]
-                wf_out_i = {'wf_ids': '', 'wf_centres': '', 'wf_spreads': ''}
-                #wf_out_i['wf_ids'] = int(line.split()[-7])
-                wf_out_i['wf_ids'] = int(line.split('(')[0].split()[-1])
-                wf_out_i['wf_spreads'] = float(line.split(')')[1].strip())
-                #wf_out_i['wf_spreads'] = float(line.split()[-1])
-                try:
-                    x = float(
-                        line.split('(')[1].split(')')[0].split(',')[0].strip()
-                    )
-                except (ValueError, IndexError):
-                    # To avoid that the crasher completely fails, we set None as a fallback
-                    x = None
-                try:
-                    y = float(
-                        line.split('(')[1].split(')')[0].split(',')[1].strip()
-                    )
-                except (ValueError, IndexError):
-                    y = None
-                try:
-                    z = float(
-                        line.split('(')[1].split(')')[0].split(',')[2].strip()
-                    )
-                except (ValueError, IndexError):
-                    z = None
-                coord = (x, y, z)
-                wf_out_i['wf_centres'] = coord
-                wf_out.append(wf_out_i)
-            out.update({'wannier_functions_output': wf_out})
-            for i in range(i + 2, i + 6):  # pylint: disable=redefined-outer-name
-                line = wann_out_file[i]
-                if 'Omega I' in line:
-                    out.update({'Omega_I': float(line.split()[-1])})
-                if 'Omega D' in line:
-                    out.update({'Omega_D': float(line.split()[-1])})
-                if 'Omega OD' in line:
-                    out.update({'Omega_OD': float(line.split()[-1])})
-                if 'Omega Total' in line:
-                    out.update({'Omega_total': float(line.split()[-1])})
-
-        if ' Maximum Im/Re Ratio' in line:
-            wann_functions = out['wannier_functions_output']
-            wann_id = int(line.split()[3])
-            wann_function = wann_functions[wann_id - 1]
-            wann_function.update({'im_re_ratio': float(line.split()[-1])})
-    if not w90_conv:
-        out['warnings'].append(
-            'Wannierisation finished because num_iter was reached.'
-        )
-    return out
+        The files are passed to the band parsers as open handles, so they
+        are never loaded in memory as lists of lines.
+
+        :param out_folder: the retrieved folder
+        :param seedname: the seedname of the calculation
+        :param retrieved_names: set of the names of the retrieved files
+        :return: a list of warnings
+        """
+        band_dat_name = '{}_band.dat'.format(seedname)
+        band_kpt_name = '{}_band.kpt'.format(seedname)
+        band_labelinfo_name = '{}_band.labelinfo.dat'.format(seedname)
+        if not {band_dat_name, band_kpt_name}.issubset(retrieved_names):
+            # _band.* files not present
+            return []
+
+        structure = self.node.inputs.structure
+        ## TODO: should we catch exceptions here?
+        if band_labelinfo_name in retrieved_names:
+            with out_folder.open(band_dat_name) as band_dat, \
+                    out_folder.open(band_kpt_name) as band_kpt, \
+                    out_folder.open(band_labelinfo_name) as band_labelinfo:
+                output_bandsdata, band_warnings = band_parser(
+                    band_dat, band_kpt, band_labelinfo, structure
+                )
+        else:  # use legacy parser for wannier90 < 3.0
+            if 'kpoint_path' not in self.node.inputs:
+                # the legacy parser needs the input kpoint_path for the labels
+                return []
+            special_points = self.node.inputs.kpoint_path.get_dict()
+            with out_folder.open(band_dat_name) as band_dat, \
+                    out_folder.open(band_kpt_name) as band_kpt:
+                output_bandsdata, band_warnings = band_parser_legacy(
+                    band_dat, band_kpt, special_points, structure
+                )
+        self.out('interpolated_bands', output_bandsdata)
+        return band_warnings
+
+
+def _read_columns(handle, usecols, skip_header=0):
+    """
+    Read columns of numbers from a band file with np.loadtxt, which is much
+    faster than np.genfromtxt. If a value cannot be converted (e.g. when
+    Wannier90 prints '********' for a number that does not fit its format),
+    read the file again with np.genfromtxt, which sets such values to NaN.
+
+    :param handle: open handle (or list of lines) of the file
+    :param usecols: the columns to read
+    :param skip_header: number of lines to skip at the top of the file
+    :return: the numpy array with the values
+    """
+    import numpy as np
+
+    try:
+        return np.loadtxt(handle, skiprows=skip_header, usecols=usecols)
+    except ValueError:
+        if hasattr(handle, 'seek'):
+            handle.seek(0)
+        return np.genfromtxt(handle, skip_header=skip_header, usecols=usecols)
 
 
 def band_parser(band_dat, band_kpt, band_labelinfo, structure):
@@ -313,21 +197,19 @@ def band_parser(band_dat, band_kpt, band_labelinfo, structure):
     Parsers the bands output data to construct a BandsData object which is then
     returned. Used for wannier90 >= 3.0
 
-    :param band_dat: list of str with each str stores one line of aiida_band.dat file
-    :param band_kpt: list of str with each str stores one line of aiida_band.kpt file
-    :param band_labelinfo: list of str with each str stores one line in aiida_band.labelinfo.dat file
+    :param band_dat: open handle (or list of lines) of the aiida_band.dat file
+    :param band_kpt: open handle (or list of lines) of the aiida_band.kpt file
+    :param band_labelinfo: open handle (or list of lines) of the aiida_band.labelinfo.dat file
     :return: BandsData object constructed from the input params
     """
-    import numpy as np
-
     from aiida.orm import BandsData
     from aiida.orm import KpointsData
 
     warnings = []
 
     # imports the data
-    out_kpt = np.genfromtxt(band_kpt, skip_header=1, usecols=(0, 1, 2))
-    out_dat = np.genfromtxt(band_dat, usecols=1)
+    out_kpt = _read_columns(band_kpt, usecols=(0, 1, 2), skip_header=1)
+    out_dat = _read_columns(band_dat, usecols=1)
 
     # reshaps the output bands
     out_dat = out_dat.reshape(
@@ -380,8 +262,8 @@ def band_parser_legacy(band_dat, band_kpt, special_points, structure):  # pylint
     from the input kpoints to construct a BandsData object which is then
     returned. Cannot handle discontinuities in the kpath, if two points are
     assigned to same spot only one will be passed. Used for wannier90 < 3.0
-    :param band_dat: list of str with each str stores one line of aiida_band.dat file
-    :param band_kpt: list of str with each str stores one line of aiida_band.kpt file
+    :param band_dat: open handle (or list of lines) of the aiida_band.dat file
+    :param band_kpt: open handle (or list of lines) of the aiida_band.kpt file
     :param special_points: special points to add labels to the bands a dictionary in
         the form expected in the input as described in the wannier90 documentation
     :return: BandsData object constructed from the input params,
@@ -405,8 +287,8 @@ def band_parser_legacy(band_dat, band_kpt, special_points, structure):  # pylint
     ))
 
     # imports the data
-    out_kpt = np.genfromtxt(band_kpt, skip_header=1, usecols=(0, 1, 2))
-    out_dat = np.genfromtxt(band_dat, usecols=1)
+    out_kpt = _read_columns(band_kpt, usecols=(0, 1, 2), skip_header=1)
+    out_dat = _read_columns(band_dat, usecols=1)
 
     # reshaps the output bands
     out_dat = out_dat.reshape(
@@ -24,7 +24,7 @@ class MinimalW90WorkChain(WorkChain):
     @classmethod
     def define(cls, spec):
         """Define the process specification."""
-        super(MinimalW90WorkChain, cls).define(spec)
+        super().define(spec)
         spec.input(
             'pw_code',
             valid_type=orm.Code,
@@ -8,6 +8,7 @@
 # For further information on the license, see the LICENSE.txt file             #
 ################################################################################
 
+import numpy as np
 import pytest
 
 from aiida import orm
@@ -77,6 +78,140 @@ def test_no_kpoint_path(
     })
 
 
+def test_exiting_in_stdout(
+    fixture_localhost,
+    generate_calc_job_node,
+    generate_parser,
+    generate_win_params_gaas,
+):
+    """Check that an 'Exiting......' message in the stdout is detected, and the partial output is still parsed."""
+    node = generate_calc_job_node(
+        entry_point_name=ENTRY_POINT_CALC_JOB,
+        computer=fixture_localhost,
+        test_name='gaas/exiting',
+        inputs=generate_win_params_gaas(),
+    )
+    parser = generate_parser(ENTRY_POINT_PARSER)
+    results, calcfunction = parser.parse_from_node(
+        node, store_provenance=False
+    )
+
+    assert calcfunction.is_finished, calcfunction.exception
+    assert calcfunction.is_failed, calcfunction.exit_status
+    assert calcfunction.exit_status == node.process_class.exit_codes.ERROR_EXITING_MESSAGE_IN_STDOUT.status
+    assert 'output_parameters' in results
+    assert results['output_parameters'].get_dict()['number_wfs'] == 4
+
+
+def test_unrecognized_stdout(
+    fixture_localhost,
+    generate_calc_job_node,
+    generate_parser,
+    generate_win_params_gaas,
+    tmp_path,
+):
+    """Check that a stdout file without the Wannier90 banner is rejected before being parsed, keeping the nnkp file."""
+    node = generate_calc_job_node(
+        entry_point_name=ENTRY_POINT_CALC_JOB,
+        computer=fixture_localhost,
+        test_name='gaas/unrecognized',
+        inputs=generate_win_params_gaas(),
+    )
+    (tmp_path / 'aiida.nnkp').write_text('begin kpoints\nend kpoints\n')
+    parser = generate_parser(ENTRY_POINT_PARSER)
+    results, calcfunction = parser.parse_from_node(
+        node, store_provenance=False, retrieved_temporary_folder=str(tmp_path)
+    )
+
+    assert calcfunction.is_finished, calcfunction.exception
+    assert calcfunction.is_failed, calcfunction.exit_status
+    assert calcfunction.exit_status == node.process_class.exit_codes.ERROR_OUTPUT_STDOUT_UNRECOGNIZED.status
+    assert 'output_parameters' not in results
+    assert 'nnkp_file' in results
+
+
+def test_malformed_value_in_stdout(
+    fixture_localhost,
+    generate_calc_job_node,
+    generate_parser,
+    generate_win_params_gaas,
+):
+    """Check that a value Wannier90 could not print (e.g. '************') does not make the stdout unrecognized."""
+    node = generate_calc_job_node(
+        entry_point_name=ENTRY_POINT_CALC_JOB,
+        computer=fixture_localhost,
+        test_name='gaas/malformed_value',
+        inputs=generate_win_params_gaas(),
+    )
+    parser = generate_parser(ENTRY_POINT_PARSER)
+    results, calcfunction = parser.parse_from_node(
+        node, store_provenance=False
+    )
+
+    assert calcfunction.is_finished, calcfunction.exception
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    assert 'output_parameters' in results
+    output_parameters = results['output_parameters'].get_dict()
+    assert output_parameters['Omega_I'] is None
+    assert output_parameters['Omega_D'] == 0.008029517
+
+
+def test_malformed_band_value(
+    fixture_localhost,
+    generate_calc_job_node,
+    generate_parser,
+    generate_win_params_gaas,
+):
+    """Check that a band energy Wannier90 could not print (e.g. '********') is parsed as NaN."""
+    node = generate_calc_job_node(
+        entry_point_name=ENTRY_POINT_CALC_JOB,
+        computer=fixture_localhost,
+        test_name='gaas/band_malformed',
+        inputs=generate_win_params_gaas(),
+    )
+    parser = generate_parser(ENTRY_POINT_PARSER)
+    results, calcfunction = parser.parse_from_node(
+        node, store_provenance=False
+    )
+
+    assert calcfunction.is_finished, calcfunction.exception
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    assert 'output_parameters' in results
+    assert 'interpolated_bands' in results
+
+    bands = results['interpolated_bands'].get_bands()
+    assert bands.shape == (3, 2)
+    assert np.isnan(bands[1, 1])
+    assert np.isnan(bands).sum() == 1
+
+
+def test_band_parser_legacy_no_kpoint_path(
+    fixture_localhost,
+    generate_calc_job_node,
+    generate_parser,
+    generate_win_params_o2sr,
+):
+    """Check that the legacy bands are skipped, without failing, if the 'kpoint_path' is not set."""
+    inputs = generate_win_params_o2sr()
+    del inputs['kpoint_path']
+    node = generate_calc_job_node(
+        entry_point_name=ENTRY_POINT_CALC_JOB,
+        computer=fixture_localhost,
+        test_name='o2sr/band_legacy',
+        inputs=inputs,
+    )
+    parser = generate_parser(ENTRY_POINT_PARSER)
+    results, calcfunction = parser.parse_from_node(
+        node, store_provenance=False
+    )
+
+    assert calcfunction.is_finished, calcfunction.exception
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    assert not orm.Log.objects.get_logs_for(node)
+    assert 'output_parameters' in results
+    assert 'interpolated_bands' not in results
+
+
 @pytest.mark.parametrize("band_parser", ("new", "legacy"))
 def test_band_parser(
     fixture_localhost, generate_calc_job_node, generate_parser,